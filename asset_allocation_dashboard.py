@@ -1,12 +1,17 @@
+import html
+import json
+import time
 import streamlit as st
 import yfinance as yf
+import yfinance_cache as yfc
 import pandas as pd
-import pandas_datareader.data as web
+import numpy as np
 import plotly.express as px
 from datetime import datetime, timedelta
-import google.generativeai as genai
-from duckduckgo_search import DDGS
+from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor
 from curl_cffi import requests
+from numba import njit
 
 session = requests.Session(impersonate="chrome")
 
@@ -20,7 +25,7 @@ st.set_page_config(
 )
 
 # 커스텀 CSS
-st.markdown("""
+_CSS = """
     <style>
     .big-font {
         font-size: 50px !important;
@@ -50,37 +55,69 @@ st.markdown("""
         margin-right: 10px;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # -----------------------------------------------------------------------------
 # 2. 데이터 가져오기 함수 (캐싱 적용)
 # -----------------------------------------------------------------------------
+@njit(cache=True)
+def last_ma(close, window):
+    # 마지막 window 구간의 평균만 필요하므로 전체 rolling 대신 합계 한 번으로 계산
+    n = len(close)
+    if n < window:
+        return np.nan
+    s = 0.0
+    for i in range(n - window, n):
+        s += close[i]
+    return s / window
+
+def fetch_qqq_close(start):
+    # 일봉은 yfinance-cache 디스크 캐시(L2)를 거쳐 증분만 받아옴
+    # end를 지정하면 당일 봉이 빠지므로(종료일 미포함) 생략해 오늘까지 받아옴
+    # max_age는 get_financial_data의 ttl(1시간)과 맞춰 L2 캐시가 더 오래된 봉을 주지 않게 함
+    return yfc.Ticker("QQQ", session=session).history(start=start.date(), max_age="1h")['Close']
+
+def fetch_fred_latest(series_id, start):
+    # FRED CSV 엔드포인트를 직접 호출하고, 마지막 줄부터 거꾸로 읽어 유효한 최신값 하나만 파싱
+    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}&cosd={start:%Y-%m-%d}"
+    resp = session.get(url, timeout=5)
+    resp.raise_for_status()
+    for line in reversed(resp.text.strip().splitlines()):
+        date_str, _, value = line.rpartition(',')
+        try:
+            return float(value), date_str
+        except ValueError:
+            # 결측치('.')나 헤더 줄은 건너뜀
+            continue
+    raise ValueError(f"FRED {series_id} 데이터가 비어 있습니다.")
+
 @st.cache_data(ttl=3600)
 def get_financial_data():
     try:
-        # A. QQQ 데이터 및 200일 이동평균선
         end_date = datetime.now()
-        start_date = end_date - timedelta(days=730)
-        
-        qqq = yf.Ticker("QQQ",session = session)
-        qqq_hist = qqq.history(start=start_date, end=end_date)
-        
-        if qqq_hist.empty:
+        # 200 거래일 + 여유분(약 210 거래일)만 받아옴
+        start_date = end_date - timedelta(days=310)
+        fred_start = end_date - timedelta(days=365)
+
+        # QQQ와 FRED 요청은 서로 독립적이므로 동시에 보냄
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            f1 = ex.submit(fetch_qqq_close, start_date)
+            f2 = ex.submit(fetch_fred_latest, 'BAMLH0A0HYM2', fred_start)
+            qqq_close = f1.result()
+            spread_latest = f2.result()
+
+        # A. QQQ 데이터 및 200일 이동평균선
+        if qqq_close.empty:
             st.error("QQQ 데이터를 가져올 수 없습니다.")
             return None, None, None, None
 
-        qqq_hist['MA200'] = qqq_hist['Close'].rolling(window=200).mean()
-        
-        current_price = qqq_hist['Close'].iloc[-1]
-        current_ma200 = qqq_hist['MA200'].iloc[-1]
+        close = qqq_close.to_numpy(dtype=np.float64)
+        current_price = close[-1]
+        current_ma200 = last_ma(close, 200)
         
         # B. 하이일드 스프레드 (FRED)
-        fred_start = end_date - timedelta(days=365)
-        spread_data = web.DataReader('BAMLH0A0HYM2', 'fred', fred_start, end_date)
-        
-        spread_data = spread_data.dropna()
-        current_spread = spread_data['BAMLH0A0HYM2'].iloc[-1]
-        spread_date = spread_data.index[-1].strftime('%Y-%m-%d')
+        current_spread, spread_date = spread_latest
 
         return current_price, current_ma200, current_spread, spread_date
 
@@ -91,66 +128,205 @@ def get_financial_data():
 # -----------------------------------------------------------------------------
 # 3. 시장 상태 판단 로직
 # -----------------------------------------------------------------------------
+# 국면별 (표시 문구, 색상 이름, 배경색, 글자색)
+_REGIMES = {
+    "on": ("평온기 (Risk On)", "green", "#d4edda", "#155724"),
+    "off": ("공포기 (Risk Off)", "red", "#f8d7da", "#721c24"),
+    "neu": ("경계기 (Neutral/Caution)", "orange", "#fff3cd", "#856404"),
+}
+
+# classify()가 돌려주는 코드(0/1/2) 순서대로 정렬한 국면 튜플
+_REGIME_TABLE = (_REGIMES["on"], _REGIMES["off"], _REGIMES["neu"])
+
+# 배열 입력용: 코드 배열로 바로 인덱싱할 수 있게 튜플을 원소로 갖는 object 배열을 미리 만들어 둠
+_REGIME_ARRAY = np.empty(len(_REGIME_TABLE), dtype=object)
+for _code, _regime in enumerate(_REGIME_TABLE):
+    _REGIME_ARRAY[_code] = _regime
+
+def classify(price, ma200, spread):
+    # 스칼라/배열 모두 처리: 0=평온기, 1=공포기, 2=경계기 (백테스트 등 날짜별 일괄 판정용)
+    price, ma200, spread = np.asarray(price), np.asarray(ma200), np.asarray(spread)
+    return np.where(
+        (spread < 3.5) & (price > ma200), 0,
+        np.where((spread > 5.0) & (price < ma200), 1, 2)
+    )
+
 def determine_market_regime(price, ma200, spread):
-    if spread < 3.5 and price > ma200:
-        return "평온기 (Risk On)", "green", "#d4edda", "#155724"
-    elif spread > 5.0 and price < ma200:
-        return "공포기 (Risk Off)", "red", "#f8d7da", "#721c24"
-    else:
-        return "경계기 (Neutral/Caution)", "orange", "#fff3cd", "#856404"
+    codes = classify(price, ma200, spread)
+    if codes.ndim == 0:
+        return _REGIME_TABLE[int(codes)]
+    return _REGIME_ARRAY[codes]
 
 # -----------------------------------------------------------------------------
 # 4. 포트폴리오 비중 정의
 # -----------------------------------------------------------------------------
+_TICKERS = ['QQQ', 'ITA', 'EMXC', 'SHYG', 'TLT', 'GLD', 'BIL']
+_DESC = ['나스닥 100', '미국 방산', '이머징마켓(중국제외)', '하이일드 채권', '미국 장기채', '금', '초단기채(현금)']
+
+# 국면별 비중은 고정값이므로 모듈 로딩 시 한 번만 DataFrame으로 만들어 둠
+_PORTFOLIOS = {
+    "평온기": pd.DataFrame({'자산': _TICKERS, '비중(%)': [40, 0, 20, 40, 0, 0, 0], '설명': _DESC}),
+    "공포기": pd.DataFrame({'자산': _TICKERS, '비중(%)': [0, 0, 0, 0, 50, 20, 30], '설명': _DESC}),
+    "경계기": pd.DataFrame({'자산': _TICKERS, '비중(%)': [20, 10, 0, 30, 20, 20, 0], '설명': _DESC}),
+}
+
 def get_portfolio_weights(regime_code):
-    tickers = ['QQQ', 'ITA', 'EMXC', 'SHYG', 'TLT', 'GLD', 'BIL']
-    
-    if "평온기" in regime_code:
-        weights = [40, 0, 20, 40, 0, 0, 0]
-        desc = ['나스닥 100', '미국 방산', '이머징마켓(중국제외)', '하이일드 채권', '미국 장기채', '금', '초단기채(현금)']
-    elif "공포기" in regime_code:
-        weights = [0, 0, 0, 0, 50, 20, 30]
-        desc = ['나스닥 100', '미국 방산', '이머징마켓(중국제외)', '하이일드 채권', '미국 장기채', '금', '초단기채(현금)']
-    else: # 경계기
-        weights = [20, 10, 0, 30, 20, 20, 0]
-        desc = ['나스닥 100', '미국 방산', '이머징마켓(중국제외)', '하이일드 채권', '미국 장기채', '금', '초단기채(현금)']
-        
-    df = pd.DataFrame({
-        '자산': tickers,
-        '비중(%)': weights,
-        '설명': desc
-    })
-    return df
+    # 반환된 DataFrame은 읽기 전용으로만 사용 (차트/표 렌더링)
+    for key, df in _PORTFOLIOS.items():
+        if key in regime_code:
+            return df
+    return _PORTFOLIOS["경계기"]
+
+# 국면 문구가 3가지뿐이므로 파이 차트도 문구별로 캐시해 재사용
+@st.cache_data
+def build_pie(regime_text: str):
+    portfolio_df = get_portfolio_weights(regime_text)
+    active_assets = portfolio_df[portfolio_df['비중(%)'] > 0]
+    fig = px.pie(
+        active_assets, 
+        values='비중(%)', 
+        names='자산', 
+        title='자산 배분 비율',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
 
 # -----------------------------------------------------------------------------
-# 5. AI 리스크 분석 함수 (DuckDuckGo + Gemini)
+# 5. AI 리스크 분석 함수 (Google News + Gemini)
 # -----------------------------------------------------------------------------
-# [수정된 뉴스 수집 함수: yfinance 사용]
-def get_latest_news():
+# [대체 뉴스 수집 함수: Google News RSS 실패 시 yfinance 티커 뉴스 사용]
+def _fetch_ticker_news(ticker):
+    # 최신 뉴스 3개씩만 가져오기
+    news_list = yf.Ticker(ticker, session=session).news or []
+    return news_list[:3]
+
+def _get_ticker_news():
     news_text = ""
+    # 1. 나스닥(QQQ)과 하이일드(HYG) 관련 뉴스 가져오기 (티커별 요청을 동시에 실행)
+    tickers = ["QQQ", "HYG"]
+    ex = ThreadPoolExecutor(max_workers=len(tickers))
+    futures = {ticker: ex.submit(_fetch_ticker_news, ticker) for ticker in tickers}
     try:
-        # 1. 나스닥(QQQ)과 하이일드(HYG) 관련 뉴스 가져오기
-        tickers = ["QQQ", "HYG"]
-        for ticker in tickers:
-            stock = yf.Ticker(ticker)
-            news_list = stock.news
-            
-            # 최신 뉴스 3개씩만 가져오기
-            for news in news_list[:3]:
+        for ticker, future in futures.items():
+            try:
+                news_list = future.result(timeout=5)
+            except Exception:
+                # 느리거나 실패한 티커는 건너뛰고 나머지 뉴스로 진행
+                continue
+            for news in news_list:
                 title = news.get('title', '')
                 # yfinance 뉴스는 본문 전체가 없을 때가 많아 제목으로 승부
                 news_text += f"- [{ticker}] {title}\n"
-                
-    except Exception as e:
-        news_text = f"뉴스 수집 중 오류 발생: {e}"
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+    return news_text
+
+def _get_google_news(keywords, max_items=9, recency="1d"):
+    # 여러 키워드를 OR 쿼리 하나로 묶어 Google News RSS를 한 번만 요청
+    # when: 연산자가 없으면 관련도순이라 몇 주 지난 기사도 섞이므로 최근 기사로 제한
+    keyword_query = " OR ".join(f'"{k}"' for k in keywords)
+    query = quote_plus(f"({keyword_query}) when:{recency}")
+    url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
+    resp = session.get(url, timeout=5)
+    resp.raise_for_status()
+    import feedparser  # AI 브리핑에서만 쓰므로 첫 화면 로딩에서 제외
+    feed = feedparser.parse(resp.content)
+    return "".join(f"- {entry.get('title', '')}\n" for entry in feed.entries[:max_items])
+
+def get_latest_news():
+    news_text = ""
+    try:
+        news_text = _get_google_news(["Nasdaq 100", "QQQ", "high yield bond"])
+    except Exception:
+        # RSS 수집 실패 시 yfinance 티커 뉴스로 대체
+        pass
+
+    if not news_text:
+        try:
+            news_text = _get_ticker_news()
+        except Exception as e:
+            news_text = f"뉴스 수집 중 오류 발생: {e}"
         
     return news_text
 
+def _has_gemini_key():
+    # secrets.toml 자체가 없으면 st.secrets 조회가 FileNotFoundError를 내므로 함께 처리
+    try:
+        return bool(st.secrets["GEMINI_API_KEY"])
+    except (KeyError, FileNotFoundError):
+        return False
+
+# Gemini 모델은 세션/재실행 간에 하나만 만들어 재사용
+@st.cache_resource
+def _gemini_client():
+    from google import genai  # 무거운 SDK는 첫 분석 요청 시 한 번만 로딩
+    return genai.Client(api_key=st.secrets["GEMINI_API_KEY"])
+
+# 한 번의 호출로 필요한 항목을 모두 받도록 응답 형식을 JSON 스키마로 고정
+_RISK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "top_news": {"type": "array", "items": {"type": "string"}},
+        "risks": {"type": "string"},
+        "regime": {"type": "string", "enum": ["평온", "경계", "공포"]},
+        "summary": {"type": "string"},
+    },
+    "required": ["top_news", "risks", "regime", "summary"],
+}
+
+def _parse_risk_result(text):
+    # 모델 응답이 스키마와 다르면 ValueError를 내서 호출부가 오류 메시지로 처리하게 함
+    result = json.loads(text)
+    if not isinstance(result, dict):
+        raise ValueError("분석 결과가 JSON 객체가 아닙니다.")
+    for key in ("regime", "risks", "summary"):
+        if not isinstance(result.get(key), str) or not result[key].strip():
+            raise ValueError(f"분석 결과에 '{key}' 항목이 없습니다.")
+    top_news = result.get("top_news")
+    if not isinstance(top_news, list):
+        top_news = []
+    result["top_news"] = [news for news in top_news if isinstance(news, str)][:3]
+    return result
+
+# 지표가 한쪽으로 뚜렷하게 쏠려 있으면 뉴스/LLM 없이도 결론이 같으므로 정형 문구로 대체
+def clear_cut_briefing(price, ma200, spread):
+    if spread < 2.5 and price > 1.03 * ma200:
+        return {
+            "top_news": [],
+            "regime": "평온",
+            "risks": f"스프레드 {spread:.2f}%로 매우 낮고 QQQ가 200일선 대비 {price / ma200 - 1:.1%} 위에 있어 뚜렷한 악재 신호가 없습니다.",
+            "summary": "현재 포트폴리오 유지",
+        }
+    if spread > 7.0 and price < 0.95 * ma200:
+        return {
+            "top_news": [],
+            "regime": "공포",
+            "risks": f"스프레드 {spread:.2f}%로 급등했고 QQQ가 200일선 대비 {1 - price / ma200:.1%} 아래에 있어 위험 회피 국면이 명확합니다.",
+            "summary": "방어 자산 중심으로 리밸런싱 검토 권장",
+        }
+    return None
+
+# 분석 결과 캐시 (전체 세션 공유). 스트리밍 중 화면 갱신 콜백을 받아야 해서
+# st.cache_data 대신 bucket 키로 직접 관리
+@st.cache_resource
+def _risk_result_cache():
+    return {}
+
 # [분석 함수: 수정된 get_latest_news() 호출]
-def analyze_risk():
+# bucket 값이 10분마다 바뀌므로 같은 구간 내 반복 클릭은 캐시에서 바로 반환
+def analyze_risk(bucket: int, on_text=None):
+    cache = _risk_result_cache()
+    # 다른 세션이 구간 경계에서 clear()할 수 있으므로 조회는 get() 한 번으로 처리
+    cached = cache.get(bucket)
+    if cached is not None:
+        return cached, None
+
+    from google.genai import types
+
     news_data = get_latest_news()
-    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-    model = genai.GenerativeModel('gemini-2.5-flash') 
+    client = _gemini_client()
     prompt = f"""
     아래는 방금 수집한 최신 금융 뉴스 헤드라인입니다:
     {news_data}
@@ -158,17 +334,102 @@ def analyze_risk():
     이 헤드라인들을 바탕으로 우리 포트폴리오(나스닥 기술주, 하이일드 채권)에 
     영향을 줄 만한 '악재'가 있는지 분석해주세요.
     
-    결과는 아래 양식으로 3줄 요약해줘:
-    1. 시장 분위기: (평온 / 경계 / 공포 중 택1)
-    2. 핵심 이슈: (헤드라인 중 가장 중요한 내용 한 문장)
-    3. 대응 조언: (현재 포트폴리오 유지 또는 리밸런싱 검토 권장)
+    결과는 아래 항목으로 JSON 형식에 맞춰 답해줘:
+    - top_news: 가장 중요한 헤드라인 최대 3개
+    - regime: 시장 분위기 (평온 / 경계 / 공포 중 택1)
+    - risks: 핵심 이슈 (헤드라인 중 가장 중요한 내용 한 문장)
+    - summary: 대응 조언 (현재 포트폴리오 유지 또는 리밸런싱 검토 권장)
     """
     
-    response = model.generate_content(prompt)
-    return response.text
+    # 토큰이 도착하는 대로 화면에 보여주고, JSON 파싱은 스트림이 끝난 뒤 한 번만 수행
+    # 실패 시에는 캐시하지 않고 (None, 오류 메시지)를 돌려줌
+    buf = ""
+    finish_reason = None
+    blocked = False
+    try:
+        stream = client.models.generate_content_stream(
+            model='gemini-2.5-flash',
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=_RISK_SCHEMA,
+                # 2.5-flash는 추론(thinking) 토큰도 출력 한도에 포함되므로 추론을 끄고
+                # 한도 전체를 3줄 요약 분량의 실제 응답에만 사용
+                thinking_config=types.ThinkingConfig(thinking_budget=0),
+                max_output_tokens=256,
+                temperature=0.2,
+            ),
+        )
+        for chunk in stream:
+            buf += chunk.text or ""
+            if chunk.candidates and chunk.candidates[0].finish_reason:
+                finish_reason = chunk.candidates[0].finish_reason
+            if chunk.prompt_feedback and chunk.prompt_feedback.block_reason:
+                blocked = True
+            if on_text is not None:
+                on_text(buf)
+    except Exception as e:
+        # 할당량 초과, 5xx, 네트워크 오류 등은 스트림 도중에도 발생할 수 있음
+        return None, f"AI 분석 요청 중 오류가 발생했습니다: {e}"
+
+    if finish_reason == types.FinishReason.MAX_TOKENS:
+        return None, "AI 응답이 길이 제한에 걸려 중간에 잘렸습니다. 잠시 후 다시 시도해주세요."
+    if blocked or finish_reason not in (None, types.FinishReason.STOP):
+        return None, "AI 응답이 안전 필터 등으로 중단되어 분석 결과를 표시할 수 없습니다."
+    try:
+        result = _parse_risk_result(buf)
+    except ValueError:
+        # 형식이 깨진 응답 (json.JSONDecodeError 포함)
+        return None, "AI 응답 형식이 올바르지 않아 분석 결과를 표시할 수 없습니다. 잠시 후 다시 시도해주세요."
+    cache.clear()
+    cache[bucket] = result
+    return result, None
 
 # -----------------------------------------------------------------------------
-# 6. 메인 앱 실행
+# 6. AI 리스크 브리핑 섹션
+# -----------------------------------------------------------------------------
+@st.fragment
+def ai_briefing_section(price, ma200, spread):
+    st.subheader("🤖 AI 리스크 브리핑 (Google News + Gemini 2.5)")
+    st.caption("최신 뉴스 헤드라인을 수집(Google News RSS)한 뒤, Gemini가 시장 위험도를 분석합니다. (API 검색 쿼터 미사용)")
+
+    with st.container():
+        if st.button("🚀 최신 뉴스 검색 및 리스크 분석 실행"):
+            result = clear_cut_briefing(price, ma200, spread)
+            if result is None and not _has_gemini_key():
+                st.error("GEMINI_API_KEY가 설정되지 않았습니다. secrets.toml을 확인해주세요.")
+                return
+            st.markdown("#### 💡 분석 결과")
+            placeholder = st.empty()
+
+            def show_partial(text):
+                # 수신 중인 JSON은 HTML로 해석되지 않도록 코드 블록으로만 표시
+                placeholder.code(text, language="json")
+
+            if result is None:
+                with st.spinner("최신 뉴스를 수집하고 Gemini가 분석 중입니다..."):
+                    result, error = analyze_risk(int(time.time() // 600), on_text=show_partial)
+                if result is None:
+                    placeholder.empty()
+                    st.error(error)
+                    return
+            else:
+                st.caption("지표가 뚜렷해 뉴스 검색/AI 분석 없이 규칙 기반으로 요약했습니다.")
+
+            placeholder.markdown(
+                f'<div class="ai-box">'
+                f'<b>1. 시장 분위기:</b> {html.escape(result["regime"])}<br>'
+                f'<b>2. 핵심 이슈:</b> {html.escape(result["risks"])}<br>'
+                f'<b>3. 대응 조언:</b> {html.escape(result["summary"])}'
+                f'</div>',
+                unsafe_allow_html=True
+            )
+            if result["top_news"]:
+                st.markdown("##### 📰 주요 뉴스")
+                st.markdown("\n".join(f"- {news}" for news in result["top_news"]))
+
+# -----------------------------------------------------------------------------
+# 7. 메인 앱 실행
 # -----------------------------------------------------------------------------
 def main():
     st.title("🛡️ 동적 자산배분 대시보드")
@@ -205,7 +466,7 @@ def main():
         st.caption("현재 데이터와 무관하게, 특정 상황일 때의 포트폴리오를 미리 확인해볼 수 있습니다.")
         sim_mode = st.radio(
             "보고 싶은 시장 상태를 선택하세요:",
-            ["실시간 진단 (자동)", "평온기 (Risk On)", "경계기 (Neutral/Caution)", "공포기 (Risk Off)"],
+            ["실시간 진단 (자동)", _REGIMES["on"][0], _REGIMES["neu"][0], _REGIMES["off"][0]],
             horizontal=True,
             label_visibility="collapsed"
         )
@@ -213,14 +474,9 @@ def main():
     if sim_mode == "실시간 진단 (자동)":
         regime_text, color_name, bg_color, text_color = real_regime_text, real_color, real_bg, real_text
         is_simulated = False
-    elif "평온기" in sim_mode:
-        regime_text, color_name, bg_color, text_color = "평온기 (Risk On)", "green", "#d4edda", "#155724"
-        is_simulated = True
-    elif "공포기" in sim_mode:
-        regime_text, color_name, bg_color, text_color = "공포기 (Risk Off)", "red", "#f8d7da", "#721c24"
-        is_simulated = True
-    else: 
-        regime_text, color_name, bg_color, text_color = "경계기 (Neutral/Caution)", "orange", "#fff3cd", "#856404"
+    else:
+        sim_key = "on" if "평온기" in sim_mode else "off" if "공포기" in sim_mode else "neu"
+        regime_text, color_name, bg_color, text_color = _REGIMES[sim_key]
         is_simulated = True
     
     st.subheader(f"현재 시장 상태: {regime_text}")
@@ -255,17 +511,7 @@ def main():
     col_chart, col_table = st.columns([1, 1])
 
     with col_chart:
-        active_assets = portfolio_df[portfolio_df['비중(%)'] > 0]
-        fig = px.pie(
-            active_assets, 
-            values='비중(%)', 
-            names='자산', 
-            title='자산 배분 비율',
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_pie(regime_text), use_container_width=True)
 
     with col_table:
         st.markdown("##### 상세 비중 및 설명")
@@ -280,17 +526,8 @@ def main():
         
     st.divider()
 
-    # D. AI 리스크 브리핑 (DuckDuckGo + Gemini)
-    st.subheader("🤖 AI 리스크 브리핑 (DuckDuckGo News + Gemini 2.0)")
-    st.caption("최신 뉴스를 검색(DuckDuckGo)하여 텍스트를 추출한 뒤, Gemini가 시장 위험도를 분석합니다. (API 검색 쿼터 미사용)")
-
-    with st.container():
-        if st.button("🚀 최신 뉴스 검색 및 리스크 분석 실행"):
-            with st.spinner("DuckDuckGo에서 뉴스를 수집하고 Gemini가 분석 중입니다..."):
-                result_text =  analyze_risk()
-                
-                st.markdown("#### 💡 분석 결과")
-                st.markdown(f'<div class="ai-box">{result_text}</div>', unsafe_allow_html=True)
+    # D. AI 리스크 브리핑 (버튼 클릭 시 이 섹션만 다시 실행)
+    ai_briefing_section(price, ma200, spread)
 
 if __name__ == "__main__":
     main()